@@ -18,6 +18,7 @@ RECORD_NAME_MAXLEN = int(os.getenv("RECORD_NAME_MAXLEN") or 100)
 HOST = os.getenv('REDIS_HOST') or 'localhost'
 PORT = os.getenv('REDIS_PORT') or 6379
 DB = os.getenv('REDIS_DB') or 0
+SOCKET = os.getenv('REDIS_SOCKET') or None
 
 RECORDING_DIR = os.getenv('RECORDING_DIR') or './recordings'
 DEFAULT_CHANNEL = 'all'
@@ -25,3 +26,8 @@ DEFAULT_CHANNEL = 'all'
 IGNORE_STREAMS = {RECORD_KEY, REPLAY_KEY, RECORD_PAUSE_KEY, REPLAY_PAUSE_KEY, REPLAY_SEEK_KEY}
 CMD_IGNORE_DISPLAY = {'multi', 'exec'}
 STORAGE_FORMAT = os.getenv('RECORD_STORAGE_FORMAT') or 'zip'
+STORAGE_COMPRESSION = os.getenv('RECORD_STORAGE_COMPRESSION') or None
+# run the zip/blob channel writers in this many worker processes (0 = in the recorder).
+# NOTE: the workers are spawned, which re-imports the caller's __main__ module, 
+# so scripts that record with this set need an `if __name__ == '__main__':` guard.
+WRITER_PROCESSES = int(os.getenv('RECORD_WRITER_PROCESSES') or 0)
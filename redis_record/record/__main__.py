@@ -1,2 +1,3 @@
 from .streams import cli
-cli()
\ No newline at end of file
+if __name__ == '__main__':
+    cli()
\ No newline at end of file
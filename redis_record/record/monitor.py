@@ -84,7 +84,7 @@ def record(
                         continue
                     cmd_name = cmd_items[0].decode().lower()
                     if cmd_name not in CMD_IGNORE_DISPLAY:
-                        pbar.set_description(cmd_name)
+                        pbar.set_description(cmd_name, refresh=False)
 
                     # listen for delete key
                     if cmd_name == 'del':
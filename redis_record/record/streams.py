@@ -1,14 +1,13 @@
 # Class to record all desired redis activity
 
-import base64
-import fnmatch
 import time
+import bisect
 import tqdm
 import redis
 
 from .. import util
 from ..storage.recorder import get_recorder
-from ..config import *
+from ..config import HOST, PORT, DB, SOCKET, RECORD_KEY, RECORD_PAUSE_KEY, RECORDING_DIR, STORAGE_FORMAT, IGNORE_STREAMS
 from .. import cmd
 
 
@@ -17,9 +16,9 @@ def record(
         record_key=RECORD_KEY, 
         pause_key=RECORD_PAUSE_KEY,
         out_dir=RECORDING_DIR, 
-        stream_refresh=3000, data_block=1000, wait_block=3000, no_streams_sleep=1000,
-        single_recording=None, recording_type=STORAGE_FORMAT,
-        host=HOST, port=PORT, db=DB
+        stream_refresh=3000, data_block=1000, data_count=100, wait_block=3000, no_streams_sleep=1000,
+        single_recording=None, recording_type=STORAGE_FORMAT, write_queue=1000,
+        host=HOST, port=PORT, db=DB, unix_socket_path=SOCKET
 ):
     '''Record redis streams to file.
     
@@ -31,8 +30,11 @@ def record(
         out_dir (str): the directory to write recordings to.
         stream_refresh (int): the number of milliseconds between querying for new streams.
         data_block (int): How long to block for data (in milliseconds).
+        data_count (int): The maximum number of entries to read from each stream per request.
         wait_block (int): How long to block for recording name changes (in milliseconds). It only blocks if no recording is currently happening.
-        no_streams_sleep (int): How long to sleep (in milliseconds) if no streams are available. 
+        no_streams_sleep (int): How long to wait (in milliseconds) for recording changes if no streams are available, before checking for streams again. 
+        write_queue (int): How many writes can be queued for the background writer thread. If 0, writes happen in the main loop.
+        unix_socket_path (str): Connect to redis using a unix socket instead of host/port (for a local redis).
     '''
     record_name = name  # 
     single_recording = bool(name) if single_recording is None else single_recording
@@ -47,11 +49,21 @@ def record(
     if ignore_streams is not False:
         ignore_streams = list(ignore_streams) + list(IGNORE_STREAMS)
 
-    r = redis.Redis(host=host, port=port, db=db)
+    if unix_socket_path:
+        r = redis.Redis(unix_socket_path=unix_socket_path, db=db)
+    else:
+        r = redis.Redis(host=host, port=port, db=db)
+    # stream discovery + filtering happens server-side
+    scan_sha = r.script_load(util.SCAN_STREAMS_LUA)
+    scan_args = util.scan_streams_args(stream_patterns, [record_key, *(ignore_streams or [])])
     pbar = tqdm.tqdm()
+    # bind functions used in the loop to locals
+    monotonic_ns = time.monotonic_ns
+    parse_stream_id = util.parse_stream_id
+    parse_next, parse_latest, queue_latest = util.parse_next, util.parse_latest, util.queue_latest
     paused = False
     try:
-        with get_recorder(type=recording_type, out_dir=out_dir) as rec, r:
+        with get_recorder(type=recording_type, out_dir=out_dir, queue_size=write_queue) as rec, r:
             # initialize cursor
             cursor = {s: '$' for s in stream_ids}
             rec_cursor = {record_key: '0', pause_key: '0'}
@@ -63,13 +75,18 @@ def record(
                 rec_cursor[record_key] = record_start_timestamp
                 tqdm.tqdm.write(f"Starting recording: {record_name}")
                 cmd.start_recording(r, record_name, record_start_timestamp)
+                rec.ensure_writer(record_name)
 
-            t0s = 0
+            # monotonic milliseconds of the last stream refresh (None until the first one)
+            t0_ms = None
+            latest = keys = None
             while True:
                 # ---------------------- Watch for changes in recording ---------------------- #
 
-                # query for recording name stream
-                results, rec_cursor = util.read_latest(r, rec_cursor, block=False if record_name else wait_block)
+                # query for recording name stream (unless it was already fetched alongside the data)
+                if latest is None:
+                    latest = util.read_latest(r, rec_cursor, block=False if record_name else wait_block)
+                (results, rec_cursor), latest = latest, None
 
                 # check for recording changes
                 for sid, xs in results:
@@ -91,23 +108,24 @@ def record(
                                 # ------------------------------- Finishing up ------------------------------- #
 
                                 if record_name:  # finish up active recording
-                                    rec.ensure_writer(record_name)
-                                    tstamp = util.parse_epoch_time(t)
+                                    end_ms = parse_stream_id(t)[0]  # sequence numbers aren't comparable across streams
 
                                     while cursor:
                                         # read data from redis and write to file
-                                        results, cursor = util.read_next(r, cursor, block=data_block)
+                                        results, cursor = util.read_next(r, cursor, block=data_block, count=data_count)
                                         result_sids = {s for s, x in results if x}
                                         for sid, xs in results:
-                                            for t, x in xs:
-                                                # the data is from after the recording ended.
-                                                if util.parse_epoch_time(t) > tstamp:
-                                                    result_sids.remove(sid)
-                                                    break
-                                                # write data
-                                                pbar.set_description(f'{sid} {t}')
-                                                rec.write(sid, util.parse_epoch_time(t), x)
-                                                pbar.update()
+                                            # the data is from after the recording ended.
+                                            # entries are ordered, so only check the last one 
+                                            # and only search for the cutoff if needed.
+                                            if xs and parse_stream_id(xs[-1][0])[0] > end_ms:
+                                                result_sids.remove(sid)
+                                                xs = xs[:bisect.bisect_right(xs, end_ms, key=lambda x: parse_stream_id(x[0])[0])]
+                                            # write data
+                                            if xs:
+                                                pbar.set_description(f'{sid} {xs[-1][0]}', refresh=False)
+                                                rec.write_many(sid, xs)
+                                                pbar.update(len(xs))
 
                                         # update cursor to only include active streams
                                         cursor = {k: v for k, v in cursor.items() if k in result_sids}
@@ -119,47 +137,74 @@ def record(
                                 record_name = x
                                 record_start_timestamp = t
                                 cursor = {sid: record_start_timestamp for sid in stream_ids}
+                                t0_ms = None  # get the stream list for the new recording right away
+                                if record_name:
+                                    rec.ensure_writer(record_name)
 
                                 tqdm.tqdm.write(f'{"new recording:" if record_name else "ended recording"}: {record_name} {record_start_timestamp}')
 
                 # no recording...
                 if not record_name or paused:
+                    keys = None
                     continue
 
                 # --------------------------- Query for new streams -------------------------- #
 
-                # keep up-to-date list of streams
-                t1s = time.time()
-                if stream_patterns and t1s - t0s > stream_refresh / 1000:
-                    keys = {x.decode('utf-8') for x in r.scan_iter(match=stream_ids or None, _type='stream')}
-                    for k in keys - set(cursor):
-                        if (
-                            k != record_key and
-                            not any(fnmatch.fnmatch(k, p) for p in ignore_streams) and
-                            any(fnmatch.fnmatch(k, p) for p in stream_patterns)
-                        ):
+                # keep up-to-date list of streams. The list is refreshed along with the data read 
+                # below - we only scan separately if we don't have one yet or aren't reading anything.
+                if stream_patterns:
+                    t1_ms = monotonic_ns() // 1_000_000
+                    if keys is None and (t0_ms is None or not cursor and t1_ms - t0_ms > stream_refresh):
+                        keys = util.eval_script(r, scan_sha, util.SCAN_STREAMS_LUA, *scan_args)
+                    if keys is not None:
+                        for k in {x.decode('utf-8') for x in keys} - set(cursor):
                             tqdm.tqdm.write(f"adding stream: {k} {record_start_timestamp}")
                             cursor[k] = record_start_timestamp
-                    t0s = t1s
+                        t0_ms = t1_ms
+                keys = None
 
                 # no streams to record, just wait.
                 if not cursor:
-                    # we sleep but we have the record start timestamp so we won't lose any data.
-                    # We just can't sleep too long and fall behind
-                    tqdm.tqdm.write("no cursor. sleeping")
-                    time.sleep(no_streams_sleep/1000)
+                    # block on the recording keys so redis wakes us up if the recording changes.
+                    # we have the record start timestamp so we won't lose any data.
+                    # We just can't wait too long and fall behind
+                    tqdm.tqdm.write("no cursor. waiting")
+                    latest = util.read_latest(r, rec_cursor, block=no_streams_sleep)
                     continue
 
                 # ---------------------------- Pull data and write --------------------------- #
 
-                # read data from redis and write to file
-                results, cursor = util.read_next(r, cursor, block=data_block)
-                rec.ensure_writer(record_name)
+                # read data from redis, along with the next recording state and
+                # (if it's time to refresh) the stream list, in a single round trip
+                with r.pipeline(transaction=False) as p:
+                    p.xread(cursor, block=data_block, count=data_count)
+                    queue_latest(p, rec_cursor)
+                    if stream_patterns and monotonic_ns() // 1_000_000 - t0_ms > stream_refresh:
+                        p.evalsha(scan_sha, 0, *scan_args)
+                    data, *latest = p.execute(raise_on_error=False)
+                if len(latest) > len(rec_cursor):
+                    keys = latest.pop()
+                    if isinstance(keys, redis.exceptions.NoScriptError):
+                        # e.g. redis restarted. reload it for the next refresh
+                        r.script_load(util.SCAN_STREAMS_LUA)
+                        keys = None
+                for res in (data, *latest, keys):
+                    if isinstance(res, Exception):
+                        raise res
+                latest = parse_latest(rec_cursor, latest)
+                if any(xs for sid, xs in latest[0] if sid == record_key):
+                    # the recording changed - leave this data to be re-read when
+                    # finishing up so it's cut off at the change.
+                    keys = None
+                    continue
+                results, cursor = parse_next(cursor, data)
+
+                # write to file
                 for sid, xs in results:
-                    for t, x in xs:
-                        pbar.set_description(f'{sid} {t}')
-                        rec.write(sid, util.parse_epoch_time(t), data=x)
-                        pbar.update()
+                    if xs:
+                        pbar.set_description(f'{sid} {xs[-1][0]}', refresh=False)
+                        rec.write_many(sid, xs)
+                        pbar.update(len(xs))
     finally:
         if single_recording:
             cmd.stop_recording(r)
@@ -1,5 +1,5 @@
 import time
-import json
+import orjson
 import tqdm
 import base64
 import redis
@@ -20,7 +20,7 @@ def replay(name, host=HOST, port=PORT, db=DB, realtime=True, speed_fudge=1, reco
         reader = make_reader(f)
         print(reader.get_header())
         for schema, channel, message in reader.iter_messages():
-            args = json.loads(message.data)['cmd']
+            args = orjson.loads(message.data)['cmd']
             args = [base64.b64decode(x.encode()) for x in args]
             t1 = message.publish_time*10e-9 * 10e-3 # for some reason it's -12 not -9??
 
@@ -33,8 +33,8 @@ def replay(name, host=HOST, port=PORT, db=DB, realtime=True, speed_fudge=1, reco
                     time.sleep(delay/speed_fudge) # FIXME recalc speed accounting for lost time. /speed_fudge is a quick fix.
                 t0 = t1
 
+            pbar.set_description(f'{t1:.3f} {b" ".join(args[:2])}', refresh=False)
             pbar.update()
-            pbar.set_description(f'{t1:.3f} {b" ".join(args[:2])}')
             r.execute_command(*args)
 
 def cli():
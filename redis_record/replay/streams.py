@@ -20,8 +20,8 @@ def replay_once(name, host=HOST, port=PORT, db=DB, realtime=True, speed_fudge=1,
             if realtime:
                 sync.sync(ts)
 
+            pbar.set_description(f'{ts:.3f} {stream_id}', refresh=False)
             pbar.update()
-            pbar.set_description(f'{ts:.3f} {stream_id}')
             r.xadd(stream_id, data, '*') # t1
 
 def replay(
@@ -98,8 +98,8 @@ def replay(
         if realtime:
             sync.sync(ts)
 
+        pbar.set_description(f'{ts:.3f} {stream_id}', refresh=False)
         pbar.update()
-        pbar.set_description(f'{ts:.3f} {stream_id}')
         r.xadd(stream_id, data, '*') # t1
 
 
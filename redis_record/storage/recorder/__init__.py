@@ -1,7 +1,15 @@
 from redis_record.config import STORAGE_FORMAT
 
 
-def get_recorder(*a, type=STORAGE_FORMAT, **kw):
+def get_recorder(*a, type=STORAGE_FORMAT, queue_size=0, **kw):
+    rec = _get_recorder(*a, type=type, **kw)
+    if queue_size:
+        from .base import ThreadedRecorder
+        rec = ThreadedRecorder(rec, queue_size)
+    return rec
+
+
+def _get_recorder(*a, type=STORAGE_FORMAT, **kw):
     # XXX: not extensible
     if type == 'mcap':
         from .mcap import MCAPRecorder
@@ -9,5 +17,8 @@ def get_recorder(*a, type=STORAGE_FORMAT, **kw):
     if type == 'zip':
         from .zip import ZipRecorder
         return ZipRecorder(*a, **kw)
+    if type == 'blob':
+        from .blob import BlobRecorder
+        return BlobRecorder(*a, **kw)
     
     raise ValueError(f"Unknown recorder type: {type}")
\ No newline at end of file
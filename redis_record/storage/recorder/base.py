@@ -1,4 +1,5 @@
-
+import queue
+import threading
 import logging
 
 log = logging.getLogger(__name__)
@@ -34,6 +35,11 @@ class BaseRecorder:
     def write(self, sid, timestamp, data):
         raise NotImplementedError
 
+    def write_many(self, sid, records):
+        '''Write a batch of ``(timestamp, data)`` records (e.g. from a single XREAD) to one stream.'''
+        for timestamp, data in records:
+            self.write(sid, timestamp, data)
+
     def close(self):
         pass
 
@@ -42,3 +48,76 @@ class BaseRecorder:
 
     def ensure_channel(self, sid):
         raise NotImplementedError
+
+
+class ThreadedRecorder:
+    '''Wraps a recorder so that file writes happen in a background thread.
+    
+    Calls are queued in order, so the caller only waits on file I/O when the queue is full.
+    '''
+    def __init__(self, recorder, maxsize=1000):
+        self.recorder = recorder
+        self.queue = queue.Queue(maxsize)
+        self.thread = None
+        self.error = None
+
+    def __enter__(self):
+        self.recorder.__enter__()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *a):
+        try:
+            self.join()
+        finally:
+            self.recorder.__exit__(*a)
+
+    def join(self):
+        '''Wait for all queued calls to finish and stop the thread.
+        
+        Raises if any of the queued calls failed.
+        '''
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            raise RuntimeError("The recorder thread failed.") from self.error
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error is not None:  # drop everything after a failure
+                continue
+            func, a, kw = item
+            try:
+                func(*a, **kw)
+            except Exception as e:
+                log.exception("Error in recorder thread")
+                self.error = e
+
+    def _put(self, func, *a, **kw):
+        if self.error is not None:
+            raise RuntimeError("The recorder thread failed.") from self.error
+        if self.thread is None:
+            return func(*a, **kw)
+        self.queue.put((func, a, kw))
+
+    def write(self, sid, timestamp, data):
+        self._put(self.recorder.write, sid, timestamp, data)
+
+    def write_many(self, sid, records):
+        self._put(self.recorder.write_many, sid, records)
+
+    def close(self):
+        self._put(self.recorder.close)
+
+    def ensure_writer(self, name, force=False):
+        self._put(self.recorder.ensure_writer, name, force=force)
+        return self
+
+    def ensure_channel(self, sid):
+        self._put(self.recorder.ensure_channel, sid)
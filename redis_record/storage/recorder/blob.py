@@ -0,0 +1,113 @@
+import os
+import struct
+import orjson
+from .zip import ZipRecorder, ChunkWriter
+from ...util import format_epoch_time
+from ...config import STORAGE_COMPRESSION, WRITER_PROCESSES
+
+import logging
+
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+MB = 1024 * 1024
+LENGTH = struct.Struct('<Q')
+COPY_LIMIT = 64 * 1024  # larger records are written from their own buffer instead of being copied
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+class BlobRecorder(ZipRecorder):
+    '''Like the zip recorder, but each chunk is written as a flat file of length-prefixed 
+    records along with a json index. This avoids building a zip central directory.'''
+    def __init__(self, out_dir='.', max_len=1000, max_size=9.5*MB, compression=STORAGE_COMPRESSION, workers=WRITER_PROCESSES):
+        super().__init__(out_dir, max_len, max_size, workers)
+        self.compression = compression
+
+    def _writer_spec(self, out_dir):
+        return BlobWriter, (out_dir, self.max_len, self.max_size, self.compression)
+
+
+class BlobWriter(ChunkWriter):
+    '''Writes ``{t0}_{t1}.bin`` (``<u64 length><data>`` records) and ``{t0}_{t1}.idx`` 
+    (a json list of ``[timestamp, offset, length]``) for each chunk.
+    
+    If ``compression='zstd'``, each record is compressed separately (so they can still be
+    read individually) and the data file is named ``{t0}_{t1}.zst.bin``.
+    '''
+    def __init__(self, out_dir, max_len=1000, max_size=9.5*MB, compression=None):
+        super().__init__(out_dir, max_len, max_size)
+        # small records are framed into one contiguous buffer as they arrive. Large 
+        # ones are kept by reference in ``bufs`` (after the buffer so far) and the 
+        # whole chunk is flushed with writev.
+        self.buffer = bytearray()
+        self.bufs = []
+        self.size = 0
+        self.index = []
+        self.compression = compression
+        self._compress = None
+        if compression == 'zstd':
+            import zstandard
+            self._compress = zstandard.ZstdCompressor(level=3).compress
+        elif compression:
+            raise ValueError(f"Unknown compression: {compression}")
+
+    def write_many(self, records):
+        for data, ts in records:
+            self._append(data, ts)
+            self._maybe_dump()
+
+    def _append(self, data, ts):
+        if not isinstance(ts, str):
+            ts = format_epoch_time(ts)
+        if self._compress is not None:
+            data = self._compress(data)
+        self.buffer += LENGTH.pack(len(data))
+        self.index.append((ts, self.size + LENGTH.size, len(data)))
+        self.size += LENGTH.size + len(data)
+        if len(data) >= COPY_LIMIT:
+            self.bufs += (self.buffer, data)
+            self.buffer = bytearray()
+        else:
+            self.buffer += data
+
+    def _maybe_dump(self):
+        if len(self.index) >= self.max_len or self.size >= self.max_size:
+            self._dump()
+
+    def _dump(self):
+        if not self.index:
+            return
+        base = os.path.join(self.out_dir, f'{self.index[0][0]}_{self.index[-1][0]}')
+        write_buffers(f'{base}.zst.bin' if self.compression else f'{base}.bin', [*self.bufs, self.buffer])
+        # the index is written last so a chunk is only visible once it's complete
+        with open(f'{base}.idx', 'wb') as f:
+            f.write(orjson.dumps(self.index))
+        self.buffer = bytearray()
+        self.bufs.clear()
+        self.index.clear()
+        self.size = 0
+
+    def close(self):
+        self._dump()
+
+
+def write_buffers(fname, bufs):
+    '''Write a list of buffers to a new file, using one ``writev`` syscall per ``IOV_MAX`` buffers.'''
+    if not hasattr(os, 'writev'):  # e.g. windows
+        with open(fname, 'wb') as f:
+            f.writelines(bufs)
+        return
+    fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        for i in range(0, len(bufs), IOV_MAX):
+            chunk = bufs[i:i + IOV_MAX]
+            n = os.writev(fd, chunk)
+            # finish a partial write
+            rest = memoryview(b''.join(chunk))[n:] if n < sum(map(len, chunk)) else b''
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
@@ -2,12 +2,12 @@
 
 import os
 import time
-import json
+import orjson
 import base64
 from mcap.writer import Writer
 from .base import BaseRecorder
 from ...config import DEFAULT_CHANNEL
-from ...util import move_with_suffix
+from ...util import move_with_suffix, parse_epoch_time
 
 import logging
 
@@ -47,7 +47,7 @@ class MCAPRecorder(BaseRecorder):
             self.schema_id = writer.register_schema(
                 name="data",
                 encoding="jsonschema",
-                data=json.dumps({"type": "object", **kw}).encode(),
+                data=orjson.dumps({"type": "object", **kw}),
             )
         return self
 
@@ -62,11 +62,13 @@ class MCAPRecorder(BaseRecorder):
 
     def write(self, stream_id, timestamp, data):
         self.ensure_channel(stream_id)
+        if isinstance(timestamp, str):
+            timestamp = parse_epoch_time(timestamp)
         data = {'stream_id': stream_id, 'data': prepare_data(data)}
         self.writer.add_message(
             channel_id=self.channel_ids[stream_id],
             log_time=time.time_ns(),
-            data=json.dumps(data).encode("utf-8"),
+            data=orjson.dumps(data),
             publish_time=int(timestamp * 10e9),
         )
 
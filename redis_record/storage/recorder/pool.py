@@ -0,0 +1,126 @@
+import queue
+import signal
+import traceback
+import multiprocessing
+
+import logging
+
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class WriterPool:
+    '''Runs channel writers in ``n`` worker processes so that CPU-heavy writers 
+    (e.g. compression) aren't limited by the GIL. Each channel is assigned to a 
+    worker by hash, so its writes stay in order.
+    
+    Errors in a worker are sent back and raised on the next call (or on shutdown).
+    
+    NOTE: the workers are spawned, which re-imports the caller's ``__main__`` module,
+    so scripts using this need an ``if __name__ == '__main__':`` guard.
+    '''
+    def __init__(self, n, maxsize=1000):
+        ctx = multiprocessing.get_context('spawn')
+        self.queues = [ctx.Queue(maxsize) for _ in range(n)]
+        self.errors = ctx.Queue()
+        self.error = None
+        self.procs = [ctx.Process(target=_worker, args=(q, self.errors), daemon=True) for q in self.queues]
+        for p in self.procs:
+            p.start()
+
+    def writer(self, key, cls, *a):
+        '''Create a ``cls(*a)`` writer in a worker process and get a local proxy for it.'''
+        q = self.queues[hash(key) % len(self.queues)]
+        self.check()
+        q.put((key, 'open', (cls, *a)))
+        return WriterProxy(self, q, key)
+
+    def check(self):
+        '''Raise if any of the workers failed.'''
+        self._read_errors()
+        if self.error is not None:
+            key, method, tb = self.error
+            raise RuntimeError(f"The writer process failed ({key} {method}):\n{tb}")
+
+    def _read_errors(self):
+        # keep the first error, but empty the queue so the workers can't block on it
+        while True:
+            try:
+                e = self.errors.get_nowait()
+            except queue.Empty:
+                return
+            if self.error is None:
+                self.error = e
+
+    def shutdown(self):
+        '''Close all writers and wait for the workers to finish.'''
+        for q, p in zip(self.queues, self.procs):
+            while p.is_alive():  # a dead worker won't empty its queue
+                try:
+                    q.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    self._read_errors()
+        for p in self.procs:
+            while p.is_alive():
+                self._read_errors()
+                p.join(0.1)
+        self.queues.clear()
+        self.procs.clear()
+        self.check()
+
+
+class WriterProxy:
+    '''Forwards calls to a writer living in a worker process.'''
+    def __init__(self, pool, queue, key):
+        self.pool = pool
+        self.queue = queue
+        self.key = key
+
+    def _put(self, method, *a):
+        self.pool.check()
+        self.queue.put((self.key, method, a))
+
+    def write(self, data, ts):
+        self._put('write', data, ts)
+
+    def write_many(self, records):
+        self._put('write_many', records)
+
+    def close(self):
+        self._put('close')
+
+
+def _worker(q, errors):
+    # Ctrl-C goes to the whole process group. Let the parent stop us (via the queue) 
+    # so the writers still get closed.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    writers = {}
+    failed = set()
+    while True:
+        msg = q.get()
+        if msg is None:
+            break
+        key, method, a = msg
+        if key in failed:  # drop everything after a failure
+            continue
+        try:
+            if method == 'open':
+                cls, *a = a
+                writers[key] = cls(*a)
+            elif method == 'close':
+                writers.pop(key).close()
+            else:
+                getattr(writers[key], method)(*a)
+        except Exception:
+            log.exception("Error in writer process: %s %s", key, method)
+            # exceptions aren't always picklable, so send the traceback
+            errors.put((key, method, traceback.format_exc()))
+            writers.pop(key, None)
+            failed.add(key)
+    for key, w in writers.items():
+        try:
+            w.close()
+        except Exception:
+            log.exception("Error in writer process: %s close", key)
+            errors.put((key, 'close', traceback.format_exc()))
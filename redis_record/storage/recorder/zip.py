@@ -2,6 +2,7 @@ import os
 import zipfile
 from .base import BaseRecorder
 from ...util import format_epoch_time, move_with_suffix
+from ...config import WRITER_PROCESSES
 
 import logging
 
@@ -12,23 +13,39 @@ log.setLevel(logging.INFO)
 MB = 1024 * 1024
 
 class ZipRecorder(BaseRecorder):
-    def __init__(self, out_dir='.', max_len=1000, max_size=9.5*MB):
+    '''Records each stream to a directory of zip files.
+    
+    If ``workers > 0``, the channel writers run in that many worker processes.
+    '''
+    def __init__(self, out_dir='.', max_len=1000, max_size=9.5*MB, workers=WRITER_PROCESSES):
         super().__init__()
         self.out_dir = out_dir
         self.max_len = max_len
         self.max_size = max_size
         self.recording_dir = None
         self.writer = None
+        self.workers = workers
+        self.pool = None
+
+    def __exit__(self, *a):
+        try:
+            self.close()
+        finally:
+            if self.pool is not None:
+                pool, self.pool = self.pool, None
+                pool.shutdown()
 
     def write(self, stream_id, timestamp, data):
-        assert set(data) == {b'd'}, f"zip recorder can only record a single field in a stream. got {set(data)}"
-        self.ensure_channel(stream_id)
-        timestamp = self._fix_timestamp(timestamp)
-        self.writer[stream_id].write(data[b'd'], timestamp)
+        w = self.writer.get(stream_id) or self.ensure_channel(stream_id)
+        w.write(prepare_data(data), self._fix_timestamp(timestamp))
+
+    def write_many(self, stream_id, records):
+        w = self.writer.get(stream_id) or self.ensure_channel(stream_id)
+        w.write_many([(prepare_data(data), self._fix_timestamp(ts)) for ts, data in records])
 
     def close(self):
         if self.writer:
-            for _, w in self.writer.items():
+            for w in self.writer.values():
                 w.close()
             log.info("Closed Recorder: %s", self.recording_dir)
         self.writer = None
@@ -47,45 +64,93 @@ class ZipRecorder(BaseRecorder):
         if channel not in self.writer:
             out_dir = os.path.join(self.recording_dir, channel)
             move_with_suffix(out_dir, prefix='_')
-            self.writer[channel] = ZipWriter(out_dir, self.max_len, self.max_size)
-
-
-MB = 1024 * 1024
-
-class ZipWriter:
+            cls, args = self._writer_spec(out_dir)
+            if self.workers:
+                if self.pool is None:
+                    from .pool import WriterPool
+                    self.pool = WriterPool(self.workers)
+                self.writer[channel] = self.pool.writer(out_dir, cls, *args)
+            else:
+                self.writer[channel] = cls(*args)
+        return self.writer[channel]
+
+    def _writer_spec(self, out_dir):
+        '''The writer class and arguments for a channel.'''
+        return ZipWriter, (out_dir, self.max_len, self.max_size)
+
+
+def prepare_data(data):
+    '''Get the ``d`` field - the only one the zip recorder can store.'''
+    d = data.get(b'd')
+    if d is None or len(data) != 1:
+        raise ValueError(f"zip recorder can only record a single field in a stream. got {set(data)}")
+    return d
+
+
+class ChunkWriter:
+    '''Writes a stream to a series of files in ``out_dir``, starting a new one after 
+    ``max_len`` records or ``max_size`` bytes.'''
     def __init__(self, out_dir, max_len=1000, max_size=9.5*MB):
-        super().__init__()
-        self.buffer = []
         self.out_dir = out_dir
         self.max_len = max_len
         self.max_size = max_size
-        self.size = 0
+        os.makedirs(self.out_dir, exist_ok=True)
 
     def __enter__(self):
-        pass
+        return self
 
     def __exit__(self, e, t, tb):
         self.close()
 
     def write(self, data, ts):
-        self.size += len(data)
+        self.write_many([(data, ts)])
+
+    def write_many(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ZipWriter(ChunkWriter):
+    '''Writes a stream to a series of zip files. Each file is kept open while it's being 
+    written to (as ``{t0}.zip.part``) and is renamed to ``{t0}_{t1}.zip`` once it's full.'''
+    def __init__(self, out_dir, max_len=1000, max_size=9.5*MB):
+        super().__init__(out_dir, max_len, max_size)
+        self.size = 0
+        self.zf = None
+        self.fname = None
+        self.first_ts = self.last_ts = None
+
+    def write_many(self, records):
+        '''Write a batch of ``(data, ts)``, starting a new file whenever the current one is full.'''
+        for d, ts in records:
+            if not isinstance(ts, str):
+                ts = format_epoch_time(ts)
+            if self.zf is None:
+                self._open(ts)
+            self.zf.writestr(ts, d)
+            self.size += len(d)
+            self.last_ts = ts
+            if len(self.zf.filelist) >= self.max_len or self.size >= self.max_size:
+                self._finish()
+
+    def _open(self, ts):
         if not isinstance(ts, str):
             ts = format_epoch_time(ts)
-        self.buffer.append([data, ts])
-        if len(self.buffer) >= self.max_len or self.size >= self.max_size:
-            self._dump(self.buffer)
-            self.size = 0
+        self.first_ts = ts
+        self.fname = os.path.join(self.out_dir, f'{ts}.zip.part')
+        self.zf = zipfile.ZipFile(self.fname, 'w', zipfile.ZIP_STORED, True)
 
-    def _dump(self, data):
-        if not data:
+    def _finish(self):
+        '''Finalize the current file and give it its full name.'''
+        if self.zf is None:
             return
-        os.makedirs(self.out_dir, exist_ok=True)
-        fname = os.path.join(self.out_dir, f'{data[0][1]}_{data[-1][1]}.zip')
-        with zipfile.ZipFile(fname, 'a', zipfile.ZIP_STORED, False) as zf:
-            for d, ts in data:
-                zf.writestr(ts, d)
-        data.clear()
+        self.zf.close()
+        os.rename(self.fname, os.path.join(self.out_dir, f'{self.first_ts}_{self.last_ts}.zip'))
+        self.zf = self.fname = None
+        self.first_ts = self.last_ts = None
+        self.size = 0
 
     def close(self):
-        if self.buffer:
-            self._dump(self.buffer)
+        self._finish()
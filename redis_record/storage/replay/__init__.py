@@ -9,5 +9,8 @@ def get_player(*a, type=STORAGE_FORMAT, **kw):
     if type == 'zip':
         from .zip import ZipPlayer
         return ZipPlayer(*a, **kw)
+    if type == 'blob':
+        from .blob import BlobPlayer
+        return BlobPlayer(*a, **kw)
     
     raise ValueError(f"Unknown recorder type: {type}")
\ No newline at end of file
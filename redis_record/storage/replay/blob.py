@@ -0,0 +1,64 @@
+import os
+import orjson
+
+from .zip import ZipPlayer
+
+import logging
+
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class BlobPlayer(ZipPlayer):
+    '''Replays recordings written by the blob recorder.'''
+    ext = '.idx'
+
+    def _open_file(self, fname):
+        return BlobFile(fname)
+
+    def _read_file(self, fh, ts):
+        return fh.read(ts)
+
+
+class BlobFile:
+    '''A single blob chunk (``.bin`` or ``.zst.bin`` data + ``.idx`` index).'''
+    def __init__(self, fname):
+        base = fname.removesuffix('.idx')
+        with open(f'{base}.idx', 'rb') as f:
+            self.index = {ts: (offset, length) for ts, offset, length in orjson.loads(f.read())}
+        self._decompress = None
+        if os.path.isfile(f'{base}.zst.bin'):
+            import zstandard
+            self._decompress = zstandard.ZstdDecompressor().decompress
+            self.fh = open(f'{base}.zst.bin', 'rb')
+        else:
+            self.fh = open(f'{base}.bin', 'rb')
+
+    def namelist(self):
+        return list(self.index)
+
+    def read(self, ts):
+        offset, length = self.index[ts]
+        self.fh.seek(offset)
+        data = self.fh.read(length)
+        return self._decompress(data) if self._decompress is not None else data
+
+    def close(self):
+        self.fh.close()
+
+
+def replay(name, *a, **kw):
+    with BlobPlayer(name, *a, **kw) as player:
+        for sid, t, data in player.iter_messages():
+            logging.info('%s %s %s', sid, t, data)
+
+def cli():
+    import logging
+    from tqdm.contrib.logging import logging_redirect_tqdm
+    import fire
+    logging.basicConfig(level=logging.DEBUG)
+    with logging_redirect_tqdm():
+        fire.Fire(replay)
+
+if __name__ == '__main__':
+    cli()
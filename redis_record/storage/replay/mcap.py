@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import base64
 from mcap.reader import make_reader
 from redis_record.config import RECORDING_DIR
@@ -49,7 +49,7 @@ class MCAPPlayer:
         return self._parse_message(message)
 
     def _parse_message(self, message):
-        args = json.loads(message.data)
+        args = orjson.loads(message.data)
         stream_id = args['stream_id']
         data = {k: base64.b64decode(x.encode()) for k, x in args['data'].items()}
         ts = message.publish_time*10e-9 * 10e-3 # for some reason it's -12 not -9??
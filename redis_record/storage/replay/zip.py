@@ -2,9 +2,8 @@ import os
 import glob
 import zipfile
 import queue
-from fnmatch import fnmatch
 
-from redis_record.util import parse_epoch_time
+from redis_record.util import parse_epoch_time, compile_globs
 from redis_record.config import RECORDING_DIR
 
 import logging
@@ -14,6 +13,8 @@ log.setLevel(logging.INFO)
 
 
 class ZipPlayer:
+    ext = '.zip'
+
     def __init__(self, path, recording_dir=RECORDING_DIR, subset=None, raw_timestamp=None):
         self.recording_dir = path if recording_dir is None else os.path.join(recording_dir, path)
         self.subset = subset if isinstance(subset, (list, tuple, set)) else [subset] if subset else []
@@ -63,8 +64,7 @@ class ZipPlayer:
 
         # load data
         self.time_cursor = tx
-        with self.zipfh[stream_id].open(ts, 'r') as f:
-            data = f.read()
+        data = self._read_file(self.zipfh[stream_id], ts)
         # possibly load next file
         if ts >= self.file_end_timestamps[stream_id]:
             self._queue_next_file(stream_id)
@@ -86,17 +86,18 @@ class ZipPlayer:
         log.info("Closed Player: %s - streams: %s", self.recording_dir, self.subset or 'all')
 
     def _get_time_range_from_file(self, fname):
-        t0, t1 = fname.split(os.sep)[-1].removesuffix('.zip').split('_')
+        t0, t1 = fname.split(os.sep)[-1].removesuffix(self.ext).split('_')
         return t0, t1
 
     def _load_file_index(self):
+        subset = compile_globs(self.subset)
         self.file_index = {
             stream_id: [
                 (f, *self._get_time_range_from_file(f))
-                for f in sorted(glob.glob(os.path.join(self.recording_dir, stream_id, '*.zip')))
+                for f in sorted(glob.glob(os.path.join(self.recording_dir, stream_id, f'*{self.ext}')))
             ]
             for stream_id in os.listdir(self.recording_dir)
-            if not self.subset or any(fnmatch(stream_id, p) for p in self.subset)
+            if subset is None or subset.match(stream_id)
         }
         self.file_cursor = {s: -1 for s in self.file_index}
         log.debug('File Index: %s', self.file_index)
@@ -119,7 +120,7 @@ class ZipPlayer:
         fname, _, _ = self.file_index[stream_id][index]
         log.debug("queueing file: %s", fname)
         self.file_cursor[stream_id] = index
-        self.zipfh[stream_id] = zf = zipfile.ZipFile(fname, 'r', zipfile.ZIP_STORED, False)
+        self.zipfh[stream_id] = zf = self._open_file(fname)
         # load the file list
         ts = sorted(set(zf.namelist()))
         if not ts:
@@ -134,6 +135,13 @@ class ZipPlayer:
             tx = parse_epoch_time(t)
             self.queue.put((int(tx*1e6), (stream_id, t)))
 
+    def _open_file(self, fname):
+        return zipfile.ZipFile(fname, 'r', zipfile.ZIP_STORED, False)
+
+    def _read_file(self, zf, ts):
+        with zf.open(ts, 'r') as f:
+            return f.read()
+
 
 def replay(name, *a, **kw):
     with ZipPlayer(name, *a, **kw) as player:
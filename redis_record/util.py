@@ -1,6 +1,9 @@
 from __future__ import annotations
 import os
+import re
+import fnmatch
 import datetime
+from redis.exceptions import NoScriptError
 from .config import *
 
 import logging
@@ -25,6 +28,11 @@ def parse_epoch_time(tid: str|bytes):
     '''Convert a redis timestamp to epoch seconds.'''
     return int(maybe_decode(tid).split('-')[0])/1000
 
+def parse_stream_id(tid: str|bytes):
+    '''Convert a redis timestamp to a ``(milliseconds, sequence)`` tuple that sorts like redis does.'''
+    ms, _, seq = maybe_decode(tid).partition('-')
+    return int(ms), int(seq or 0)
+
 def format_epoch_time(tid: float, i='0'):
     '''Format a redis timestamp from epoch seconds.'''
     return f'{int(tid * 1000)}-{i}'
@@ -75,21 +83,114 @@ def decode_xread_format(data):
 
 def read_next(r, sids, block=0, count=1, **kw):
     data = r.xread(sids, block=block, count=count, **kw)
-    data = decode_xread_format(data)
-    sids = update_cursor(sids, data)
-    return data, sids
+    return parse_next(sids, data)
 
 def read_latest(r, sids, block=False, count=1, **kw):
     with r.pipeline() as p:
-        for sid, t in sids.items():
-            p.xrevrange(sid, '+', f'({t}', count=count, **kw)
-        data = list(zip(sids, p.execute()))
-    if block and not any(x for s, x in data):
+        queue_latest(p, sids, count=count, **kw)
+        data = p.execute()
+    if block and not any(data):
         data = r.xread(sids, block=block, count=count, **kw)
+        return parse_next(sids, data)
+    return parse_latest(sids, data)
+
+def queue_latest(p, sids, count=1, **kw):
+    '''Add the queries for ``read_latest`` to a pipeline so they can share a round trip.'''
+    for sid, t in sids.items():
+        p.xrevrange(sid, '+', f'({t}', count=count, **kw)
+    return p
+
+def parse_next(sids, data):
+    '''Decode an xread response and advance the cursor.'''
     data = decode_xread_format(data)
     sids = update_cursor(sids, data)
     return data, sids
 
+def parse_latest(sids, data):
+    '''Decode the pipeline responses queued by ``queue_latest`` and advance the cursor.'''
+    return parse_next(sids, list(zip(sids, data)))
+
+# lists the stream keys matching any of the include patterns that don't match any of the ignore lua patterns
+# ARGV: (SCAN MATCH pattern, lua pattern) for each include pattern..., '--', ignore patterns...
+SCAN_STREAMS_LUA = '''
+local include, ignore, seen, keys = {}, {}, {}, {}
+local target = include
+for _, a in ipairs(ARGV) do
+    if a == '--' and target == include then target = ignore else table.insert(target, a) end
+end
+for i = 1, #include, 2 do
+    local match, pattern = include[i], include[i + 1]
+    local cursor = '0'
+    repeat
+        local res = redis.call('SCAN', cursor, 'MATCH', match, 'TYPE', 'stream', 'COUNT', 1000)
+        cursor = res[1]
+        for _, k in ipairs(res[2]) do
+            if not seen[k] and string.find(k, pattern) then
+                seen[k] = true
+                local keep = true
+                for _, p in ipairs(ignore) do
+                    if string.find(k, p) then keep = false break end
+                end
+                if keep then table.insert(keys, k) end
+            end
+        end
+    until cursor == '0'
+end
+return keys
+'''
+
+def eval_script(r, sha, script, *args):
+    '''EVALSHA a script, (re)loading it if redis doesn't have it cached (e.g. after a restart).'''
+    try:
+        return r.evalsha(sha, 0, *args)
+    except NoScriptError:
+        r.script_load(script)
+        return r.evalsha(sha, 0, *args)
+
+def scan_streams_args(patterns, ignore=()):
+    '''Get the ARGV for ``SCAN_STREAMS_LUA``. Both include and ignore patterns are fnmatch-style globs.'''
+    include = [x for p in patterns for x in (glob_to_scan_match(p), glob_to_lua_pattern(p))]
+    return [*include, '--', *(glob_to_lua_pattern(p) for p in ignore)]
+
+def glob_to_scan_match(pattern: str):
+    '''Get a redis ``SCAN MATCH`` pattern that selects (at least) the keys matching a glob pattern.
+    
+    Redis glob syntax differs from fnmatch (e.g. ``[^a]`` vs ``[!a]``, backslash escapes), 
+    so only the literal prefix is passed to redis and the exact match is done in lua.
+    '''
+    i = next((i for i, c in enumerate(pattern) if c in '*?['), None)
+    prefix = re.sub(r'([\\*?\[\]])', r'\\\1', pattern[:i])
+    return prefix if i is None else f'{prefix}*'
+
+def compile_globs(patterns):
+    '''Combine glob patterns into a single compiled regex. Returns None if there are no patterns.'''
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)) if patterns else None
+
+def glob_to_lua_pattern(pattern: str):
+    '''Translate a glob pattern (``*``, ``?``, ``[abc]``, ``[!abc]``) to an anchored lua pattern.'''
+    out, i, n = ['^'], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            out.append('.*')
+        elif c == '?':
+            out.append('.')
+        elif c == '[' and pattern.find(']', i + 2 if pattern[i:i + 1] == '!' else i + 1) != -1:
+            # like fnmatch: a ']' right after '[' or '[!' is literal
+            j = pattern.find(']', i + 2 if pattern[i:i + 1] == '!' else i + 1)
+            body = pattern[i:j].replace('%', '%%')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            elif body.startswith('^'):  # fnmatch treats a leading '^' as a literal
+                body = '%' + body
+            out.append(f'[{body}]')
+            i = j + 1
+        else:
+            out.append(c if c.isalnum() else f'%{c}')
+    out.append('$')
+    return ''.join(out)
+
 
 def update_cursor(sids: dict[str, str], data: list[str|tuple]) -> dict[str, str]:
     for s, ts in data:
@@ -12,8 +12,8 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     entry_points={'console_scripts': ['redis-record=redis_record.cmd:cli']},
     install_requires=[
-        'redis', 'mcap', 'orjson', 'tqdm', 'fire',
+        'redis', 'hiredis>=2.0', 'mcap', 'orjson', 'tqdm', 'fire',
     ],
-    extras_require={},
+    extras_require={'zstd': ['zstandard'], 'test': ['pytest', 'docker', 'fakeredis[lua]', 'zstandard']},
     license='MIT License',
     keywords='redis record streams video streaming')
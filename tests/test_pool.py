@@ -0,0 +1,54 @@
+import os
+import signal
+import time
+import pytest
+from redis_record.storage.recorder.pool import WriterPool
+from redis_record.storage.recorder.zip import ZipRecorder
+from redis_record.storage.recorder.blob import BlobRecorder, BlobWriter
+from redis_record.storage.replay.zip import ZipPlayer
+from redis_record.storage.replay.blob import BlobPlayer
+
+
+def fake_entries(n, t0=1700000000000):
+    return [(f'{t0 + i}-0', {b'd': f'x{i}'.encode()}) for i in range(n)]
+
+
+@pytest.mark.parametrize("recorder, player", [(ZipRecorder, ZipPlayer), (BlobRecorder, BlobPlayer)])
+def test_worker_round_trip(tmp_path, recorder, player):
+    entries = fake_entries(25)
+    with recorder(str(tmp_path), max_len=10, workers=1) as rec:
+        rec.ensure_writer('rec')
+        rec.write_many('a', entries[:20])
+        for ts, data in entries[20:]:
+            rec.write('b', ts, data)
+    with player('rec', str(tmp_path), raw_timestamp=True) as p:
+        messages = list(p)
+    assert sorted((sid, ts, d['d']) for sid, ts, d in messages) == sorted(
+        ('a' if i < 20 else 'b', ts, data[b'd']) for i, (ts, data) in enumerate(entries))
+
+
+def test_worker_error(tmp_path):
+    pool = WriterPool(1)
+    # the writer fails to open in the worker
+    w = pool.writer('a', BlobWriter, str(tmp_path), 1000, 1000, 'not-a-compression')
+    try:
+        for i in range(1000):
+            w.write(b'x', f'{1700000000000 + i}-0')
+    except RuntimeError:  # may or may not show up before all of the writes are queued
+        pass
+    # shutdown still finishes and raises the error
+    with pytest.raises(RuntimeError, match='not-a-compression'):
+        pool.shutdown()
+    assert not pool.procs
+
+
+def test_worker_ignores_sigint(tmp_path):
+    pool = WriterPool(1)
+    w = pool.writer('a', BlobWriter, str(tmp_path), 1000)
+    w.write_many([(b'x', f'{1700000000000 + i}-0') for i in range(5)])
+    time.sleep(1)  # let the worker finish starting up
+    os.kill(pool.procs[0].pid, signal.SIGINT)
+    time.sleep(0.1)
+    w.close()
+    pool.shutdown()
+    assert sorted(os.listdir(tmp_path)) == ['1700000000000-0_1700000000004-0.bin', '1700000000000-0_1700000000004-0.idx']
@@ -0,0 +1,71 @@
+import os
+import zipfile
+import pytest
+from redis_record.storage.recorder.zip import ZipWriter
+from redis_record.storage.recorder.blob import BlobWriter
+from redis_record.storage.replay.blob import BlobPlayer
+
+
+def fake_records(n, size=10, t0=1700000000000):
+    return [(bytes([i % 256]) * size, f'{t0 + i}-0') for i in range(n)]
+
+
+@pytest.mark.parametrize("compression", [None, 'zstd'])
+def test_blob_round_trip(tmp_path, compression):
+    if compression:
+        pytest.importorskip('zstandard')
+    # include some records big enough to be written by reference
+    records = fake_records(20) + fake_records(5, size=100_000, t0=1700000001000)
+    with BlobWriter(str(tmp_path / 'rec' / 'a'), max_len=7, compression=compression) as w:
+        w.write_many(records[:10])
+        for data, ts in records[10:]:
+            w.write(data, ts)
+
+    suffix = '.zst.bin' if compression else '.bin'
+    assert any(f.endswith(suffix) for f in os.listdir(tmp_path / 'rec' / 'a'))
+    with BlobPlayer('rec', str(tmp_path), raw_timestamp=True) as player:
+        messages = list(player)
+    assert [sid for sid, _, _ in messages] == ['a'] * len(records)
+    assert [(d['d'], ts) for _, ts, d in messages] == records
+
+
+def test_zip_rollover_max_len(tmp_path):
+    with ZipWriter(str(tmp_path), max_len=3) as w:
+        w.write_many(fake_records(7))  # rolls over mid-batch
+    files = sorted(os.listdir(tmp_path))
+    assert files == [
+        '1700000000000-0_1700000000002-0.zip',
+        '1700000000003-0_1700000000005-0.zip',
+        '1700000000006-0_1700000000006-0.zip',
+    ]
+    with zipfile.ZipFile(tmp_path / files[0]) as zf:
+        assert zf.namelist() == ['1700000000000-0', '1700000000001-0', '1700000000002-0']
+
+
+def test_zip_rollover_max_size(tmp_path):
+    with ZipWriter(str(tmp_path), max_size=25) as w:
+        w.write_many(fake_records(5))
+    assert sorted(os.listdir(tmp_path)) == [
+        '1700000000000-0_1700000000002-0.zip',
+        '1700000000003-0_1700000000004-0.zip',
+    ]
+
+
+def test_blob_rollover_max_len(tmp_path):
+    with BlobWriter(str(tmp_path), max_len=3) as w:
+        w.write_many(fake_records(7))
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith('.idx')) == [
+        '1700000000000-0_1700000000002-0.idx',
+        '1700000000003-0_1700000000005-0.idx',
+        '1700000000006-0_1700000000006-0.idx',
+    ]
+
+
+def test_blob_rollover_max_size(tmp_path):
+    # each record is 8 bytes of length + 10 bytes of data
+    with BlobWriter(str(tmp_path), max_size=40) as w:
+        w.write_many(fake_records(5))
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith('.idx')) == [
+        '1700000000000-0_1700000000002-0.idx',
+        '1700000000003-0_1700000000004-0.idx',
+    ]
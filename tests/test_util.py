@@ -0,0 +1,57 @@
+import fnmatch
+import pytest
+from redis_record import util
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')  # for lua scripting
+
+
+@pytest.fixture
+def r():
+    r = fakeredis.FakeRedis()
+    yield r
+    r.flushall()
+
+
+GLOBS = ['*', 'a*', 'b:?', 'x[a-c]y', '[!a]x', '[^a]x', '[]a]', '[!]a]', '[abc', 'a.b', 'a%b', 'a[%]b', '(a)+', '*:*']
+NAMES = ['abc', 'a', 'b:x', 'b:xx', 'xby', 'xdy', 'ax', 'bx', '^x', ']', ']a', 'b', 'a.b', 'axb', '[abc', 'a%b', 'a]b', '(a)+', 'aa', 'x:y', '']
+
+@pytest.mark.parametrize("pattern", GLOBS)
+def test_glob_to_lua_pattern(r, pattern):
+    find = r.register_script('return string.find(ARGV[1], ARGV[2]) ~= nil')
+    lua_pattern = util.glob_to_lua_pattern(pattern)
+    for name in NAMES:
+        assert bool(find(args=[name, lua_pattern])) == fnmatch.fnmatchcase(name, pattern), (name, lua_pattern)
+
+
+@pytest.mark.parametrize("patterns, ignore, expected", [
+    (['*'], [], {'cam:main', 'cam:depth', 'cam!x', 'mic', 'record'}),
+    (['cam:*'], [], {'cam:main', 'cam:depth'}),
+    (['cam:*', 'mic'], [], {'cam:main', 'cam:depth', 'mic'}),
+    (['*'], ['record', 'cam:d*', 'cam!*'], {'cam:main', 'mic'}),
+    (['cam:*', '*'], ['mic'], {'cam:main', 'cam:depth', 'cam!x', 'record'}),
+    # include patterns use fnmatch rules too, not redis's
+    (['cam[!:]*'], [], {'cam!x'}),
+    (['cam[^!]*'], [], {'cam!x'}),
+    (['cam[:]main'], [], {'cam:main'}),
+])
+def test_scan_streams(r, patterns, ignore, expected):
+    for sid in ['cam:main', 'cam:depth', 'cam!x', 'mic', 'record']:
+        r.xadd(sid, {'d': b'x'})
+    r.set('not-a-stream', 'x')
+    sha = r.script_load(util.SCAN_STREAMS_LUA)
+    keys = util.eval_script(r, sha, util.SCAN_STREAMS_LUA, *util.scan_streams_args(patterns, ignore))
+    assert sorted(keys) == sorted(k.encode() for k in expected)  # no duplicates
+
+
+def test_glob_to_scan_match():
+    assert util.glob_to_scan_match('cam:main') == 'cam:main'
+    assert util.glob_to_scan_match('cam[!0]*') == 'cam*'
+    assert util.glob_to_scan_match('a]b\\c?') == 'a\\]b\\\\c*'
+
+
+def test_scan_streams_reloads_script(r):
+    r.xadd('mic', {'d': b'x'})
+    sha = r.script_load(util.SCAN_STREAMS_LUA)
+    r.script_flush()
+    assert util.eval_script(r, sha, util.SCAN_STREAMS_LUA, *util.scan_streams_args(['*'])) == [b'mic']